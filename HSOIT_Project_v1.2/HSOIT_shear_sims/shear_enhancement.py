@@ -2,7 +2,7 @@
 # This script computes B_low_rho and B_high_rho as functions of velocity dispersion sigma_v.
 
 import math
-import csv
+import numpy as np
 
 # Model parameters (tuned to H-SOIT predictions)
 B_max = 0.30       # maximum gravity boost (~30% at extreme conditions)
@@ -19,9 +19,50 @@ def B_high(sigma_v):
     # High-density: scaled down by factor f_high
     return 1.0 + f_high * B_max * math.tanh(sigma_v / 2064.0)
 
-# Generate shear enhancement values for sigma_v from 0 to 4000 km/s (step 50)
-with open("shear_enhancement.csv", "w", newline="") as f:
-    writer = csv.writer(f)
-    writer.writerow(["sigma_v (km/s)", "B_low_rho", "B_high_rho"])
-    for sigma in range(0, 4001, 50):
-        writer.writerow([sigma, f"{B_low(sigma):.3f}", f"{B_high(sigma):.3f}"])
\ No newline at end of file
+def B_pair(sigma_v):
+    """(B_low, B_high) for one sigma_v, sharing a single tanh evaluation."""
+    t = math.tanh(sigma_v / 2064.0)
+    return 1.0 + B_max * t, 1.0 + f_high * B_max * t
+
+def B_low_vec(sigma_array):
+    """Vectorized B_low over an array of sigma_v values."""
+    return 1.0 + B_max * np.tanh(np.asarray(sigma_array, dtype=np.float64) / 2064.0)
+
+def B_high_vec(sigma_array):
+    """Vectorized B_high over an array of sigma_v values."""
+    return 1.0 + f_high * B_max * np.tanh(np.asarray(sigma_array, dtype=np.float64) / 2064.0)
+
+# CSV layout: one printf-style template formats a whole row in a single % operation
+_CSV_HEADER = "sigma_v (km/s),B_low_rho,B_high_rho"
+_ROW_FMT = "%d,%.3f,%.3f"
+
+def _params_tag():
+    """Comment line recording the model parameters a CSV was generated with."""
+    return f"# B_max={B_max} sigma_ref={sigma_ref} f_high={f_high}"
+
+def _is_up_to_date(path):
+    """True if path exists and was generated with the current model parameters."""
+    try:
+        with open(path, "r") as f:
+            f.readline()  # column header
+            return f.readline().strip() == _params_tag()
+    except FileNotFoundError:
+        return False
+
+def write_csv(path="shear_enhancement.csv"):
+    """Generate shear enhancement values for sigma_v from 0 to 4000 km/s (step 50) and write them to path."""
+    sigma = np.arange(0, 4001, 50, dtype=np.float64)
+    t = np.tanh(sigma / 2064.0)  # shared by both density modes
+    B_lo = 1.0 + B_max * t
+    B_hi = 1.0 + f_high * B_max * t
+    # newline="" disables newline translation so rows end in \r\n on every platform
+    with open(path, "w", newline="") as f:
+        np.savetxt(f, np.column_stack([sigma, B_lo, B_hi]), fmt=_ROW_FMT,
+                   header=_CSV_HEADER + "\r\n" + _params_tag(), comments="", newline="\r\n")
+
+if __name__ == "__main__":
+    # Skip regeneration if the CSV already matches the current parameters
+    if not _is_up_to_date("shear_enhancement.csv"):
+        write_csv("shear_enhancement.csv")
+        # A fresh file must pass the check, so a second run leaves it untouched
+        assert _is_up_to_date("shear_enhancement.csv"), "parameter tag not read back from shear_enhancement.csv"
@@ -1,91 +1,164 @@
-import csv
 import math
+from bisect import bisect_right
+import numpy as np
 
-# Global containers for sigma_v and B values (loaded from CSV)
-_sigma_values = []
-_B_low_values = []
-_B_high_values = []
+# Global arrays for sigma_v and B values (loaded from CSV)
+_sigma_arr = np.empty(0)
+_B_low_arr = np.empty(0)
+_B_high_arr = np.empty(0)
+# Grid description: a uniformly spaced sigma_v grid allows O(1) interval lookup
+_sigma0 = 0.0
+_step = 0.0
+_is_uniform = False
+# Scalar interpolators specialized per mode, built by _load_data
+_interp_by_mode = {}
 
 def _load_data(csv_file="shear_enhancement.csv"):
     """
     Internal helper to load shear enhancement data from a CSV file.
-    Expects columns: sigma_v, B_low_rho, B_high_rho (with a header or comments).
-    Populates the global lists _sigma_values, _B_low_values, _B_high_values.
+    Expects columns: sigma_v, B_low_rho, B_high_rho, with a single header line
+    (plain or '#'-prefixed); further '#' lines are treated as comments.
+    Populates the global arrays _sigma_arr, _B_low_arr, _B_high_arr.
     """
-    global _sigma_values, _B_low_values, _B_high_values
-    _sigma_values = []
-    _B_low_values = []
-    _B_high_values = []
+    global _sigma_arr, _B_low_arr, _B_high_arr
+    global _sigma0, _step, _is_uniform, _interp_by_mode
     try:
-        with open(csv_file, 'r') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                # Skip empty lines or comments
-                if not row or row[0].strip().startswith('#'):
-                    continue
-                if len(row) < 3:
-                    continue  # skip if incomplete data
-                try:
-                    sigma = float(row[0])
-                    B_low = float(row[1])
-                    B_high = float(row[2])
-                except ValueError:
-                    # skip lines that cannot be parsed to float (e.g., text headers)
-                    continue
-                _sigma_values.append(sigma)
-                _B_low_values.append(B_low)
-                _B_high_values.append(B_high)
+        data = np.loadtxt(csv_file, delimiter=",", comments="#", skiprows=1,
+                          usecols=(0, 1, 2), ndmin=2)
     except FileNotFoundError:
         raise FileNotFoundError(f"Data file '{csv_file}' not found.")
+    _sigma_arr, _B_low_arr, _B_high_arr = (np.ascontiguousarray(col) for col in data.T)
+    # Detect a uniform grid (e.g. the 50 km/s grid written by shear_enhancement.py)
+    _is_uniform = False
+    if len(_sigma_arr) > 1:
+        _sigma0 = _sigma_arr[0]
+        _step = _sigma_arr[1] - _sigma_arr[0]
+        _is_uniform = bool(_step > 0 and np.allclose(np.diff(_sigma_arr), _step))
+    _interp_by_mode = {"low": _make_interp(_B_low_arr), "high": _make_interp(_B_high_arr)}
 
-# Load data immediately on module import
-_load_data()
+def _make_interp(values):
+    """
+    Build a scalar interpolator for one B series, bound to the current sigma_v grid.
+    Mode selection and grid lookups happen here once instead of on every call.
+    The closure works on Python lists: indexing them yields plain floats, avoiding
+    NumPy scalar creation and dispatch on every call.
+    """
+    sigma_list = _sigma_arr.tolist()
+    values = np.asarray(values, dtype=np.float64).tolist()
+    sigma0 = float(_sigma0)
+    step = float(_step)
+    is_uniform = _is_uniform
+    n = len(sigma_list)
+    sigma_first = sigma_list[0]
+    sigma_last = sigma_list[-1]
+    B_first = values[0]
+    B_last = values[-1]
+    # Interval found by the previous lookup (search hint for non-uniform grids)
+    last_idx = [1]
+
+    def _interp(sigma_v):
+        # If sigma_v is outside the data range, clamp to nearest value
+        if sigma_v <= sigma_first:
+            return B_first
+        if sigma_v >= sigma_last:
+            return B_last
+        # NaN fails both comparisons above; propagate it as np.interp does
+        if math.isnan(sigma_v):
+            return math.nan
+        if is_uniform:
+            # Uniform grid: the interval index follows directly from the grid spacing
+            idx_f = (sigma_v - sigma0) / step
+            i = int(idx_f)
+            if i >= n - 1:
+                return B_last
+            frac = idx_f - i
+            return values[i] + frac * (values[i+1] - values[i])
+        # Find interval i such that sigma_list[i-1] <= sigma_v < sigma_list[i].
+        # Sorted query sequences usually land in the same or a neighbouring interval as the
+        # previous call, so try that guess first (larger tables only) before a binary search.
+        i = 0
+        if n > 16:
+            guess = last_idx[0]
+            for k in (guess, guess + 1, guess - 1):
+                if 1 <= k < n and sigma_list[k-1] <= sigma_v < sigma_list[k]:
+                    i = k
+                    break
+        if i == 0:
+            i = bisect_right(sigma_list, sigma_v)
+        last_idx[0] = i
+        sigma_low = sigma_list[i-1]
+        sigma_high = sigma_list[i]
+        B_low = values[i-1]
+        B_high = values[i]
+        # Linear interpolation formula
+        frac = (sigma_v - sigma_low) / (sigma_high - sigma_low)
+        return B_low + frac * (B_high - B_low)
+
+    return _interp
+
+def _ensure_loaded():
+    """Load the data on first use rather than on module import."""
+    if _sigma_arr.size == 0:
+        _load_data()
 
 def interpolate_B(sigma_v, mode="low"):
     """
     Interpolate the shear enhancement factor B for a given velocity dispersion sigma_v.
     
     Parameters:
-        sigma_v (float): Velocity dispersion in km/s for which to interpolate B.
+        sigma_v (float or array-like): Velocity dispersion in km/s for which to interpolate B.
         mode (str): "low" for low-density scenario B_low, "high" for high-density scenario B_high.
     
     Returns:
         float: Interpolated B value (dimensionless enhancement factor).
+               For array-like sigma_v an ndarray is returned (see interpolate_B_batch).
     
     Notes:
         - If sigma_v is outside the range of the data, the function will return the boundary value 
           (no extrapolation beyond the data range is performed).
         - Linear interpolation is used between known data points.
     """
-    # Ensure data is loaded
-    if not _sigma_values:
-        _load_data()
-    # Choose the corresponding B series
+    # Plain scalars take the fast path; np.ndim is only consulted for other inputs
+    # (both callees make sure the data is loaded)
+    if isinstance(sigma_v, (int, float)):
+        return get_interpolator(mode)(sigma_v)
+    # Array-like input is handled in a single vectorized call
+    if np.ndim(sigma_v) > 0:
+        return interpolate_B_batch(sigma_v, mode)
+    return get_interpolator(mode)(sigma_v)
+
+def get_interpolator(mode="low"):
+    """
+    Return the scalar interpolator specialized for mode ("low" or "high").
+
+    Equivalent to interpolate_B(sigma_v, mode) for scalar sigma_v, without the per-call
+    mode dispatch; hot loops can bind it once. The returned function refers to the data
+    loaded at the time of the call.
+    """
+    interp = _interp_by_mode.get(mode)
+    if interp is None:
+        # Not loaded yet, or an unknown mode
+        _ensure_loaded()
+        interp = _interp_by_mode.get(mode)
+        if interp is None:
+            raise ValueError("Mode must be 'low' or 'high'.")
+    return interp
+
+def interpolate_B_batch(sigma_v, mode="low"):
+    """
+    Vectorized version of interpolate_B for an array of velocity dispersions.
+
+    Uses np.interp, which clamps to the boundary values outside the data range
+    exactly like interpolate_B. Returns an ndarray with the shape of sigma_v.
+    """
+    _ensure_loaded()
     if mode == "low":
-        values = _B_low_values
+        values = _B_low_arr
     elif mode == "high":
-        values = _B_high_values
+        values = _B_high_arr
     else:
         raise ValueError("Mode must be 'low' or 'high'.")
-    # If sigma_v is outside the data range, clamp to nearest value
-    if sigma_v <= _sigma_values[0]:
-        return values[0]
-    if sigma_v >= _sigma_values[-1]:
-        return values[-1]
-    # Find interval for interpolation
-    # (Linear search or binary search for simplicity; data is sorted ascending by sigma_v)
-    for i in range(1, len(_sigma_values)):
-        if sigma_v < _sigma_values[i]:
-            # sigma_v lies between _sigma_values[i-1] and _sigma_values[i]
-            sigma_low = _sigma_values[i-1]
-            sigma_high = _sigma_values[i]
-            B_low = values[i-1]
-            B_high = values[i]
-            # Linear interpolation formula
-            frac = (sigma_v - sigma_low) / (sigma_high - sigma_low)
-            return B_low + frac * (B_high - B_low)
-    # If we reach here (which is unlikely due to earlier checks), return last value
-    return values[-1]
+    return np.interp(np.asarray(sigma_v, dtype=np.float64), _sigma_arr, values)
 
 def plot_B_vs_sigma(save_path=None):
     """
@@ -96,12 +169,11 @@ def plot_B_vs_sigma(save_path=None):
     """
     import matplotlib.pyplot as plt
     # Ensure data is loaded and available
-    if not _sigma_values:
-        _load_data()
+    _ensure_loaded()
     # Plot data for low and high modes
     plt.figure(figsize=(6,4))
-    plt.plot(_sigma_values, _B_low_values, label="B (low density ρ)", marker='o', linestyle='-')
-    plt.plot(_sigma_values, _B_high_values, label="B (high density ρ)", marker='s', linestyle='--')
+    plt.plot(_sigma_arr, _B_low_arr, label="B (low density ρ)", marker='o', linestyle='-')
+    plt.plot(_sigma_arr, _B_high_arr, label="B (high density ρ)", marker='s', linestyle='--')
     plt.xlabel("Velocity dispersion $\sigma_v$ (km/s)")
     plt.ylabel("Enhancement factor B")
     plt.title("Shear Enhancement vs. Velocity Dispersion")
@@ -1,69 +1,110 @@
 import math
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+    prange = range
 
 # Physical constants
 k_B = 1.380649e-23  # Boltzmann constant (J/K)
 ln2 = math.log(2.0)
 
-def simulate_landauer_erasure(T, E, gamma, t_max, dt):
-    """
-    Simulate the erasure of a single bit (two-level system) coupled to a heat bath at temperature T.
-
-    - T: temperature of the bath in Kelvin.
-    - E: energy gap of the two-level system (Joules). The excited state has energy E, ground state 0.
-    - gamma: base transition rate (1/s) for spontaneous relaxation at T=0.
-    - t_max: simulation time (s).
-    - dt: time step (s).
-
-    Returns: (times, P_excited, Q_env)
-      times: list of time points,
-      P_excited: list of excited state population over time,
-      Q_env: total heat dissipated to environment up to each time point.
-    """
-    # Derived parameters
+@njit(cache=True)
+def _transition_rates(T, E, gamma):
+    """Return (gamma_down, gamma_up) for a two-level system of gap E coupled to a bath at T."""
     # Thermal occupancy of energy E at temperature T (Bose-Einstein statistic for simplicity)
-    if T <= 0:
+    x = E/(k_B * T) if T > 0 else 0.0
+    if x <= 0:
+        # No thermal excitation at T <= 0; also covers E <= 0 and E/(k_B T) underflowing to 0
         n_th = 0.0
     else:
         # Thermal occupation number for energy E (approximation using Bose-Einstein formula)
         # For a two-level system, use f = 1/(exp(E/(k_B T)) - 1). Treat bath coupling similarly.
-        n_th = 1.0 / (math.exp(E/(k_B * T)) - 1.0) if E/(k_B * T) > 1e-6 else 0.0
+        # Written as exp(-x)/(1 - exp(-x)): cannot overflow for large x, and expm1 keeps
+        # it accurate as x -> 0, where f ~ k_B T / E.
+        n_th = math.exp(-x) / -math.expm1(-x)
 
     gamma_down = gamma * (n_th + 1.0)  # decay rate (|1> -> |0|)
     gamma_up   = gamma * n_th          # excitation rate (|0> -> |1>) from bath
+    return gamma_down, gamma_up
+
+@njit(cache=True, fastmath=True)
+def _sim_core(gamma_down, gamma_up, E, dt, N):
+    """Euler integration of the two-level master equation into preallocated arrays."""
+    times = np.arange(N) * dt  # time grid is known up front; no per-step write needed
+    P_values = np.empty(N)
+    Q_values = np.empty(N)
 
     # Initialize state: at t=0, bit is in a maximally mixed state (50% in |1>)
     P_excited = 0.5
-    system_energy = P_excited * E
     Q_env = 0.0  # cumulative heat released to environment
 
-    times = []
-    P_values = []
-    Q_values = []
-
-    for step in range(int(t_max/dt) + 1):
-        t = step * dt
+    for step in range(N):
         # Record current state
-        times.append(t)
-        P_values.append(P_excited)
-        Q_values.append(Q_env)
+        P_values[step] = P_excited
+        Q_values[step] = Q_env
 
         # Compute population change (Euler integration of master equation)
         dP_dt = -gamma_down * P_excited + gamma_up * (1.0 - P_excited)
-        P_excited += dP_dt * dt
-        # Bound P_excited between 0 and 1
-        if P_excited < 0:
-            P_excited = 0.0
-        if P_excited > 1:
-            P_excited = 1.0
-
-        # Compute instantaneous heat flow:
-        # When population changes by dP, energy change of system = d(P_excited)*E.
-        # If P_excited decreases, system energy lost is released as heat to bath.
-        # If P_excited increases, heat is absorbed from bath (Q_env decreases).
-        dE_system = (P_excited * E) - system_energy
-        system_energy += dE_system
-        Q_env -= dE_system  # subtract change in system energy (if system loses energy, Q_env gains)
+        # Bound P_excited between 0 and 1 (min/max compile to branchless minsd/maxsd)
+        P_new = min(1.0, max(0.0, P_excited + dP_dt * dt))
+
+        # Heat flow: the system energy changes by E*dP (after clamping).
+        # If P_excited decreases, system energy lost is released as heat to bath;
+        # if it increases, heat is absorbed from bath (Q_env decreases).
+        Q_env -= E * (P_new - P_excited)
+        P_excited = P_new
+
+    return times, P_values, Q_values
+
+def simulate_landauer_erasure(T, E, gamma, t_max, dt):
+    """
+    Simulate the erasure of a single bit (two-level system) coupled to a heat bath at temperature T.
 
+    - T: temperature of the bath in Kelvin.
+    - E: energy gap of the two-level system (Joules). The excited state has energy E, ground state 0.
+    - gamma: base transition rate (1/s) for spontaneous relaxation at T=0.
+    - t_max: simulation time (s).
+    - dt: time step (s).
+
+    Returns: (times, P_excited, Q_env)
+      times: array of time points,
+      P_excited: array of excited state population over time,
+      Q_env: total heat dissipated to environment up to each time point.
+    """
+    gamma_down, gamma_up = _transition_rates(T, E, gamma)
+    N = max(int(t_max/dt) + 1, 0)  # a negative t_max gives empty results, not an error
+    return _sim_core(gamma_down, gamma_up, E, dt, N)
+
+@njit(cache=True)
+def _population_exact(T, E, gamma, t):
+    """Closed-form excited-state population P(t) from P0 = 0.5; t may be a scalar or an array."""
+    gamma_down, gamma_up = _transition_rates(T, E, gamma)
+    k = gamma_down + gamma_up
+    P_eq = gamma_up / k if k > 0 else 0.5
+    return P_eq + (0.5 - P_eq) * np.exp(-k * t)
+
+def simulate_landauer_erasure_analytic(T, E, gamma, t_max, dt):
+    """
+    Exact solution of the erasure master equation sampled on the same time grid as
+    simulate_landauer_erasure.
+
+    dP/dt = -gamma_down*P + gamma_up*(1-P) is linear with constant coefficients, so
+      P(t) = P_eq + (P0 - P_eq) * exp(-(gamma_down + gamma_up) t),  P_eq = gamma_up/(gamma_down + gamma_up),
+      Q_env(t) = -E * (P(t) - P0),
+    with P0 = 0.5. This has no time-step discretization error.
+
+    Returns: (times, P_excited, Q_env) as arrays.
+    """
+    P0 = 0.5
+    times = np.arange(max(int(t_max/dt) + 1, 0)) * dt
+    P_values = _population_exact(T, E, gamma, times)
+    Q_values = -E * (P_values - P0)
     return times, P_values, Q_values
 
 def compute_chi0_from_theory(c=None):
@@ -82,9 +123,12 @@ def compute_chi0_from_simulation(T, E, gamma, t_max, dt):
     """
     Estimate χ0 by simulating an erasure at temperature T and comparing dissipated heat to Landauer's limit.
 
+    The heat is taken from the closed-form solution (simulate_landauer_erasure_analytic);
+    simulate_landauer_erasure remains available as the Euler reference.
+
     Returns the estimated chi0 = (Q_actual / Q_min) - 1.
     """
-    times, P, Q = simulate_landauer_erasure(T, E, gamma, t_max, dt)
+    times, P, Q = simulate_landauer_erasure_analytic(T, E, gamma, t_max, dt)
     Q_actual = Q[-1]  # total heat at end of simulation
     Q_min = k_B * T * ln2  # Landauer limit for erasing one bit
     if Q_min == 0:
@@ -92,6 +136,51 @@ def compute_chi0_from_simulation(T, E, gamma, t_max, dt):
     chi0_est = (Q_actual / Q_min) - 1.0
     return chi0_est
 
+@njit(cache=True, fastmath=True)
+def _chi0_single(T, E, gamma, t_max, dt):
+    """Closed-form chi0 estimate for one temperature (see simulate_landauer_erasure_analytic)."""
+    t_end = int(t_max/dt) * dt  # last sample of the simulation time grid
+    P_end = _population_exact(T, E, gamma, t_end)
+    Q_actual = -E * (P_end - 0.5)
+    Q_min = k_B * T * ln2
+    if Q_min == 0:
+        return np.nan
+    return (Q_actual / Q_min) - 1.0
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _chi0_sweep_core(T_arr, E, gamma, t_max, dt):
+    out = np.full(T_arr.size, np.nan)
+    for i in prange(T_arr.size):
+        out[i] = _chi0_single(T_arr[i], E, gamma, t_max, dt)
+    return out
+
+def chi0_sweep(T_values, E, gamma, t_max, dt):
+    """
+    Estimate χ0 over a grid of bath temperatures, e.g. for χ0 vs T curves.
+
+    Equivalent to calling compute_chi0_from_simulation for each T, with the temperatures
+    evaluated in parallel when numba is available. Entries with T = 0 are NaN
+    (compute_chi0_from_simulation returns None there).
+
+    Raises ValueError unless E > 0, dt > 0, t_max >= 0, gamma >= 0 and every T is
+    finite and non-negative.
+
+    Returns an array of chi0 estimates with the same length as T_values.
+    """
+    T_arr = np.ascontiguousarray(T_values, dtype=np.float64).ravel()
+    # Validate up front: errors raised inside the parallel kernel are not propagated reliably
+    if not E > 0:
+        raise ValueError(f"E must be positive, got {E}.")
+    if not dt > 0:
+        raise ValueError(f"dt must be positive, got {dt}.")
+    if not t_max >= 0:
+        raise ValueError(f"t_max must be non-negative, got {t_max}.")
+    if not gamma >= 0:
+        raise ValueError(f"gamma must be non-negative, got {gamma}.")
+    if not np.all(np.isfinite(T_arr) & (T_arr >= 0)):
+        raise ValueError("All temperatures must be finite and non-negative.")
+    return _chi0_sweep_core(T_arr, E, gamma, t_max, dt)
+
 # Example usage (if run as a script):
 if __name__ == "__main__":
     # Example: simulate erasure at T = 300 mK
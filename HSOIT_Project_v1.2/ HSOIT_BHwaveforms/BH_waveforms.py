@@ -1,8 +1,15 @@
-import csv, math
+import math
+from bisect import bisect_left
+from functools import lru_cache
 import numpy as np
 
+# Column layout of the per-mode QNM arrays
+_COL = {'a': 0, 'omega0_R': 1, 'omega0_I': 2, 'alpha1': 3, 'alpha2': 4, 'beta1': 5, 'beta2': 6}
+_FIELDS = tuple(_COL)
+_OPTIONAL_FIELDS = ('alpha2', 'beta2')  # may be left empty in the CSV
+
 # Data structure to hold QNM template entries (by mode and spin)
-qnm_data = {}         # keys: (l, n), value: list of entries with fields below
+qnm_data = {}         # keys: (l, n), value: float64 array of shape (n_spins, len(_COL)), rows sorted by a
 spins_by_mode = {}    # record available spin values for each mode (for interpolation)
 
 def load_QNM_templates(csv_path):
@@ -10,91 +17,94 @@ def load_QNM_templates(csv_path):
     global qnm_data, spins_by_mode
     qnm_data.clear()
     spins_by_mode.clear()
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Parse numeric values from each column
-            a = float(row['a'])
-            l = int(row['l'])
-            n = int(row['n'])
-            omega0_R = float(row['omega0_R'])
-            omega0_I = float(row['omega0_I'])
-            alpha1 = float(row['alpha1'])
-            beta1  = float(row['beta1'])
-            alpha2 = float(row['alpha2']) if row['alpha2'] != '' else 0.0
-            beta2  = float(row['beta2'])  if row['beta2']  != '' else 0.0
-            mode_key = (l, n)
-            # Initialize mode list if not exists
-            if mode_key not in qnm_data:
-                qnm_data[mode_key] = []
-            qnm_data[mode_key].append({
-                'a': a,
-                'omega0_R': omega0_R,
-                'omega0_I': omega0_I,
-                'alpha1': alpha1,
-                'alpha2': alpha2,
-                'beta1': beta1,
-                'beta2': beta2
-            })
-    # Sort entries for each mode by spin a
-    for mode_key, entries in qnm_data.items():
-        entries.sort(key=lambda entry: entry['a'])
-        spins_by_mode[mode_key] = [entry['a'] for entry in entries]
+    # Frequencies memoized from previously loaded data are no longer valid,
+    # even if this reload fails part-way
+    get_frequency.cache_clear()
+    # Parse all columns in one pass; the header may be plain or '#'-prefixed.
+    # Empty fields come back masked, unparsable ones as unmasked NaN.
+    table = np.genfromtxt(csv_path, delimiter=',', names=True, dtype=np.float64,
+                          autostrip=True, ndmin=1, usemask=True)
+    columns = {}
+    for field in _FIELDS + ('l', 'n'):
+        if field in _OPTIONAL_FIELDS:
+            # Empty alpha2/beta2 fields default to 0.0
+            column = table[field].filled(0.0)
+        else:
+            column = table[field].filled(np.nan)
+        bad = np.flatnonzero(np.isnan(column))
+        if bad.size:
+            raise ValueError(f"Missing or invalid '{field}' value in {csv_path} (data row {bad[0] + 1}).")
+        columns[field] = column
+    for field in ('l', 'n'):
+        bad = np.flatnonzero(columns[field] != np.round(columns[field]))
+        if bad.size:
+            raise ValueError(f"Non-integer '{field}' value in {csv_path} (data row {bad[0] + 1}).")
+    # Rows of the whole table in _COL order
+    rows = np.column_stack([columns[field] for field in _FIELDS])
+    modes = np.column_stack([columns['l'], columns['n']]).astype(int)
+    for l, n in np.unique(modes, axis=0):
+        mode_rows = rows[(modes[:, 0] == l) & (modes[:, 1] == n)]
+        # Sort entries for each mode by spin a (stable, so duplicate spins keep file order)
+        mode_rows = mode_rows[np.argsort(mode_rows[:, _COL['a']], kind='stable')]
+        mode_key = (int(l), int(n))
+        qnm_data[mode_key] = np.ascontiguousarray(mode_rows)
+        spins_by_mode[mode_key] = mode_rows[:, _COL['a']].tolist()
     print(f"Loaded QNM data for {len(qnm_data)} modes.")
 
 def interpolate_entry(mode_key, a):
-    """Interpolate QNM data for mode (l, n) at given spin a."""
-    entries = qnm_data.get(mode_key)
-    if entries is None:
+    """
+    Interpolate QNM data for mode (l, n) at given spin a.
+    Returns a row of len(_COL) values; index it with _COL (e.g. row[_COL['omega0_R']]).
+    """
+    arr = qnm_data.get(mode_key)
+    if arr is None:
         raise ValueError(f"Mode {mode_key} not found in QNM data.")
-    # If exact match exists, return it
-    for entry in entries:
-        if abs(entry['a'] - a) < 1e-6:
-            return entry
+    # Binary search in the sorted spin list: spins[j-1] < a <= spins[j]
+    spins = spins_by_mode[mode_key]
+    j = bisect_left(spins, a)
+    # If exact match exists, return it (the first row with that spin, if it is duplicated)
+    for k in (j - 1, j):
+        if 0 <= k < len(spins) and abs(spins[k] - a) < 1e-6:
+            return arr[bisect_left(spins, spins[k])]
     # If a outside range, raise error
-    min_a = entries[0]['a']
-    max_a = entries[-1]['a']
-    if a < min_a or a > max_a:
+    min_a = spins[0]
+    max_a = spins[-1]
+    if j == 0 or j == len(spins):
         raise ValueError(f"Spin value {a} out of range [{min_a}, {max_a}] for mode {mode_key}.")
-    # Otherwise interpolate linearly between nearest entries
-    # Find first entry with spin >= a
-    idx_higher = 0
-    while entries[idx_higher]['a'] < a:
-        idx_higher += 1
-    idx_lower = idx_higher - 1
-    e_low = entries[idx_lower]
-    e_high = entries[idx_higher]
-    a_low = e_low['a']
-    a_high = e_high['a']
-    frac = (a - a_low) / (a_high - a_low)
-    # Interpolate each field
-    def lerp(x, y):
-        return x + frac * (y - x)
-    interp_entry = {}
-    interp_entry['a'] = a
-    for field in ['omega0_R', 'omega0_I', 'alpha1', 'alpha2', 'beta1', 'beta2']:
-        interp_entry[field] = lerp(e_low[field], e_high[field])
-    return interp_entry
+    # Otherwise interpolate all fields linearly between the neighbouring rows in one vector op
+    row_low = arr[j-1]
+    row_high = arr[j]
+    frac = (a - spins[j-1]) / (spins[j] - spins[j-1])
+    row = row_low + frac * (row_high - row_low)
+    row[_COL['a']] = a
+    return row
 
+@lru_cache(maxsize=1024)
 def get_frequency(a, l, n, eps):
-    """Return the complex QNM frequency for given spin a, mode (l, n), and hair fraction eps."""
+    """
+    Return the complex QNM frequency for given spin a, mode (l, n), and hair fraction eps.
+    Results are memoized; the cache is cleared whenever load_QNM_templates reloads the data.
+    """
     mode_key = (l, n)
     if mode_key not in qnm_data:
         raise RuntimeError("QNM data not loaded or mode not available.")
     entry = interpolate_entry(mode_key, a)
     # Compute complex frequency: ω = ω0 + α1*eps + α2*eps^2 (real part), similar for imaginary part
-    omega_R0 = entry['omega0_R']
-    omega_I0 = entry['omega0_I']
-    alpha1 = entry['alpha1']
-    beta1 = entry['beta1']
-    alpha2 = entry.get('alpha2', 0.0)
-    beta2 = entry.get('beta2', 0.0)
+    omega_R0 = entry[_COL['omega0_R']]
+    omega_I0 = entry[_COL['omega0_I']]
+    alpha1 = entry[_COL['alpha1']]
+    beta1 = entry[_COL['beta1']]
+    alpha2 = entry[_COL['alpha2']]
+    beta2 = entry[_COL['beta2']]
     # Frequency shifts (assuming eps small)
     delta_omega_R = alpha1 * eps + alpha2 * (eps ** 2)
     delta_omega_I = beta1  * eps + beta2  * (eps ** 2)
     omega_R = omega_R0 + delta_omega_R
     omega_I = omega_I0 + delta_omega_I
-    return complex(omega_R, omega_I)
+    return complex(float(omega_R), float(omega_I))
+
+# Samples per cumulative-product block in generate_waveform
+_RECURRENCE_BLOCK = 1024
 
 def generate_waveform(mass, spin, eps, modes=[(2, 0)], duration=0.1, dt=1e-5):
     """
@@ -104,16 +114,24 @@ def generate_waveform(mass, spin, eps, modes=[(2, 0)], duration=0.1, dt=1e-5):
     """
     # Note: If mass != 1, scale time by M (physical time = t * (G M / c^3)) if needed (not implemented here).
     t = np.arange(0, duration, dt)
-    h_total = np.zeros_like(t, dtype=np.float64)
-    for (l, n) in modes:
-        omega = get_frequency(spin, l, n, eps)  # complex frequency
-        omega_R = omega.real
-        omega_I = omega.imag  # (negative for decaying mode)
-        # Assume unit amplitude and zero initial phase for each mode
-        A_ln = 1.0
-        # Contribution: Re[A * exp(i ω_R t) * exp(ω_I t)] = A * exp(ω_I t) * cos(ω_R t)
-        h_mode = A_ln * np.exp(omega_I * t) * np.cos(omega_R * t)
-        h_total += h_mode
+    # Complex frequencies of all modes
+    omegas = np.array([get_frequency(spin, l, n, eps) for (l, n) in modes], dtype=np.complex128)
+    # Contribution: Re[A * exp(i ω_R t) * exp(ω_I t)] = A * exp(ω_I t) * cos(ω_R t) = A * Re[z^k],
+    # with z = exp((ω_I + i ω_R) dt) and t = k dt (ω_I is negative for decaying modes).
+    # Powers of z are built by a cumulative product within blocks of _RECURRENCE_BLOCK samples;
+    # each block restarts from an exactly computed exp(...) to keep rounding drift bounded.
+    lam = omegas.imag + 1j * omegas.real
+    n_blocks = -(-len(t) // _RECURRENCE_BLOCK)
+    powers = np.empty((len(modes), _RECURRENCE_BLOCK), dtype=np.complex128)
+    powers[:, 0] = 1.0
+    powers[:, 1:] = np.exp(lam * dt)[:, None]
+    powers = np.cumprod(powers, axis=1)
+    block_starts = np.exp(lam[:, None] * (np.arange(n_blocks) * _RECURRENCE_BLOCK * dt))
+    z = block_starts[:, :, None] * powers[:, None, :]
+    z = z.reshape(len(modes), n_blocks * _RECURRENCE_BLOCK)[:, :len(t)]
+    # Assume unit amplitude and zero initial phase for each mode
+    A_ln = 1.0
+    h_total = (A_ln * z.real).sum(axis=0)
     return t, h_total
 
 # If run as script, demonstrate usage